@@ -171,7 +171,7 @@ def optimize_BFLP_model(m, threads=1, tolerance=0.0,time_limit = 20000):
 def run_BFLP_model(users_and_facs_df, travel_dict, users, facs, budget_factor = 1.0,
                         cap_factor = 1.5, cutoff = 0.2, strict_assign_to_one = True,
                         cap_dict = None, continous = False, num_consider = -1, 
-                        threads=1, tolerance=0.0,time_limit = 20000, output_filename = "basic_model.json"):
+                        threads=1, tolerance=0.0,time_limit = 20000, output_filename = "basic_model.msgpack"):
     """
     Build and solve the BFLP model
     :param users_and_facs_df: dataframe of the user and facility related input data
@@ -105,7 +105,7 @@ def close_greedy_basic(users_and_facs_df, travel_dict, users, facs, budget_facto
                         cap_factor=1.5, threads=1, tolerance=0.0,cutoff_localsearch = 0.2, num_consider_in_relaxation = -1,
                         num_consider_per_iteration = 5,time_limit_relaxation=1000, assignment_method ="greedy_assign",
                         local_search_method = "None", time_limit_while_localsearch = 1, 
-                        final_assignment_method = "relaxation_rounding",output_filename = "test.json"):
+                        final_assignment_method = "relaxation_rounding",output_filename = "test.msgpack"):
     """
     Basic implementation of the close greedy algorithm for the BFLP based on the DROP procedure.
     :param users_and_facs_df: dataframe of the user and facility related input data
@@ -250,7 +250,7 @@ def close_greedy_reuse_assignment(users_and_facs_df, travel_dict, users, facs, b
                                     num_consider_per_iteration = 5,time_limit_relaxation=1000, 
                                     assignment_method ="greedy_assign", local_search_method = "None", 
                                     time_limit_while_localsearch = 1, num_fix_assignment_iteration = 50,
-                                    final_assignment_method = "relaxation_rounding",output_filename = "test.json"):
+                                    final_assignment_method = "relaxation_rounding",output_filename = "test.msgpack"):
     """
     First improvement to basic implementation of the close greedy algorithm for the BFLP based on the DROP procedure;
     this reuses the previous iterations assignment and fixes it using the greedy reassign algorithm.
@@ -406,7 +406,7 @@ def close_greedy_final(users_and_facs_df, travel_dict, users, facs, budget_facto
                         num_consider_per_iteration = 50,time_limit_relaxation=1000,
                         assignment_method ="greedy_assign",local_search_method = "None", 
                         time_limit_while_localsearch = 1, num_fix_assignment_iteration = 5,
-                        final_assignment_method = "relaxation_rounding",output_filename = "test.json",
+                        final_assignment_method = "relaxation_rounding",output_filename = "test.msgpack",
                         write_to_file = True):
     """
     Final implementation of the close greedy algorithm for the BFLP with both improvements based on the DROP procedure.
@@ -561,7 +561,7 @@ def open_greedy(users_and_facs_df, travel_dict, users, facs, budget_factor = 0.7
                 num_consider_per_iteration = 50, depth_greedy_reassignment = 1,time_limit_relaxation=1000,
                 assignment_method ="greedy_assign", local_search_method = "None", 
                 time_limit_while_localsearch = 1, num_fix_assignment_iteration = 5,
-                final_assignment_method = "relaxation_rounding",output_filename = "test.json", write_to_file = True):
+                final_assignment_method = "relaxation_rounding",output_filename = "test.msgpack", write_to_file = True):
     """
     Implementation of the open greedy algorithm for the BFLP based on the ADD procedure.
     :param users_and_facs_df: dataframe of the user and facility related input data
@@ -715,7 +715,7 @@ def localsearch_without_change(users_and_facs_df, travel_dict, users, facs, star
                                 threads_relaxation= 1,
                                 cutoff_BUAP_localsearch = 0.2, time_limit_while_BUAP_localsearch = 1,
                                 depth_greedy_reassignment = 1, fix_assignment = False,
-                                output_filename = "test_without_change.json", write_to_file = True):
+                                output_filename = "test_without_change.msgpack", write_to_file = True):
     """
     Local search based on ADD / DROP for overall problem with random chocies of which facilities to consider.
     :param users_and_facs_df: dataframe of the user and facility related input data
@@ -937,7 +937,7 @@ def localsearch_with_change(users_and_facs_df, travel_dict, users, facs, startin
                                 threads_relaxation= 1,
                                 cutoff_BUAP_localsearch = 0.2, time_limit_while_BUAP_localsearch = 1,
                                 depth_greedy_reassignment = 1, fix_assignment = False,
-                                output_filename = "test_without_change.json", write_to_file = True):
+                                output_filename = "test_without_change.msgpack", write_to_file = True):
     """
     Local search based on ADD / DROP for overall problem with choices of which facilities to consider
         based on how good they appeared to close / open in previous iterations.
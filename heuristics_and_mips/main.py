@@ -13,13 +13,13 @@ results = get_results_open_greedy(users_and_facs_df, travel_dict, users, facs,
                              assignment_methods =["greedy_assign"],local_search_methods = ["local_random_reassign"], 
                              time_limit_while_localsearch = 1, num_fix_assignment_iterations = [len(facs)],
                              depths_greedy_reassign = [1,2],
-                             final_assignment_methods = ["relaxation_rounding"],output_filename = "open_greedy_instance_1.json")
+                             final_assignment_methods = ["relaxation_rounding"],output_filename = "open_greedy_instance_1.msgpack")
 
 # similarly the code below (after uncommenting) runs the BFLP model with the given parameters
 # is_feasible, results = run_BFLP_model(users_and_facs_df, travel_dict, users, facs, budget_factor = 1.0,
 #                         cap_factor = 1.5, cutoff = 0.0, strict_assign_to_one = True,
 #                         cap_dict = None, continous = False, num_consider = -1, 
-#                         threads=1, tolerance=0.0,time_limit = 20000, output_filename = "basic_model.json")
+#                         threads=1, tolerance=0.0,time_limit = 20000, output_filename = "basic_model.msgpack")
 
 # and, again, similarly the code below (afet uncommenting) runs the BUAP model with the given parameters; 
 # this model additionally requires a set of open facilities as example of which we give below
@@ -28,8 +28,8 @@ results = get_results_all_BUAP_methods(users_and_facs_df, travel_dict, users, fa
                          cap_factor=1.5,define_u = True,cutoff_relaxation = 0.0,
                           num_consider_relaxation = 20,
                          cutoff_localsearch = 0.2, time_limit_while_localsearch = 1,
-                         output_filename = "BUAP_heuristics.json")
+                         output_filename = "BUAP_heuristics.msgpack")
 
 
 # to write the results in a file, do:
-#write_results_open_greedy_table("open_greedy_instance_1.json", "open_greedy_instance_1.xlsx","instance_1_BFLP_MIP.json")
+#write_results_open_greedy_table("open_greedy_instance_1.msgpack", "open_greedy_instance_1.xlsx","instance_1_BFLP_MIP.msgpack")
@@ -1,5 +1,5 @@
 '''
-Functions for running the heuristics with multiple inputs (get_...) resulting in a json
+Functions for running the heuristics with multiple inputs (get_...) resulting in a results list file
 and functions for converting these results into more easily readable tables (write_...)
 '''
 from BUAP_heuristics import *
@@ -19,7 +19,7 @@ def get_results_close_greedy_final(users_and_facs_df, travel_dict, users, facs,
                             num_consider_per_iterations = [5,50], time_limit_relaxation=1000,
                             assignment_methods =["greedy_assign"],local_search_methods = ["None"], 
                             time_limit_while_localsearch = 1, num_fix_assignment_iterations = [100],
-                            final_assignment_methods = ["relaxation_rounding"],output_filename = "test.json"):
+                            final_assignment_methods = ["relaxation_rounding"],output_filename = "test.msgpack"):
     '''
     Use the final version of close greedy to get results for the input instances at different input parameters
         whenever a input to this function is a list, we consider all possible combinations of input paramters
@@ -64,7 +64,7 @@ def get_results_close_greedy_final(users_and_facs_df, travel_dict, users, facs,
                                                     assignment_method = assignment_method,local_search_method = local_search_method, 
                                                     time_limit_while_localsearch = time_limit_while_localsearch,
                                                     num_fix_assignment_iteration = n_f, final_assignment_method =final_assignment_method,
-                                                    output_filename = "test.json", write_to_file = False)
+                                                    output_filename = "test.msgpack", write_to_file = False)
                             results_list.append(result)
 
     write_results_list(results_list, output_filename)
@@ -79,7 +79,7 @@ def get_results_open_greedy(users_and_facs_df, travel_dict, users, facs,
                             assignment_methods =["greedy_assign"],local_search_methods = ["None"], 
                             time_limit_while_localsearch = 1, num_fix_assignment_iterations = [100],
                             depths_greedy_reassign = [1,2],
-                            final_assignment_methods = ["relaxation_rounding"],output_filename = "test.json"):
+                            final_assignment_methods = ["relaxation_rounding"],output_filename = "test.msgpack"):
     '''
     Use the open greedy to get results for the input instances at different input parameters
         whenever a input to this function is a list, we consider all possible combinations of input paramters
@@ -128,7 +128,7 @@ def get_results_open_greedy(users_and_facs_df, travel_dict, users, facs,
                                                         time_limit_while_localsearch = time_limit_while_localsearch,
                                                         num_fix_assignment_iteration = n_f,
                                                         final_assignment_method = final_assignment_method, 
-                                                        output_filename = "test.json", write_to_file = False)
+                                                        output_filename = "test.msgpack", write_to_file = False)
                                 results_list.append(result)
 
     write_results_list(results_list, output_filename)
@@ -137,7 +137,7 @@ def get_results_open_greedy(users_and_facs_df, travel_dict, users, facs,
 def get_results_Schmitt_Singh(users_and_facs_df, travel_dict, users, facs, lb = 0.0,
                                 budget_factors = [0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2, 0.1], cap_factor = 1.5,
                                 turnover_factor = 0.02, tolerance = 5e-3, time_limit = 20000, iteration_limit = 100,
-                                output_filename = "test.json"):
+                                output_filename = "test.msgpack"):
     '''
     Runs the Schmitt Singh heuristics for all the input budget factors
     :param users_and_facs_df: dataframe of the user and facility related input data
@@ -168,7 +168,7 @@ def get_results_Schmitt_Singh(users_and_facs_df, travel_dict, users, facs, lb =
 
 def write_results_close_greedy_table(results_list_filename, output_filename, BLFP_MIP_filename, output_abs_path = None):
     '''
-    Given a json format of close greedy results, saves the relevant results as an excel table.
+    Given a results list file of close greedy results, saves the relevant results as an excel table.
     :param results_list_filename: file name of the close greedy results list, expected to be in own_results folder
     :param output_filename: file name of the output excel file
     :param BFLP_MIP_filename: file name of the corresponding results for the BFLP MIP in order to compare the results
@@ -233,7 +233,7 @@ def write_results_close_greedy_table(results_list_filename, output_filename, BLF
 
 def write_results_open_greedy_table(results_list_filename, output_filename, BLFP_MIP_filename, output_abs_path = None):
     '''
-    Given a json format of open greedy results, saves the relevant results as an excel table.
+    Given a results list file of open greedy results, saves the relevant results as an excel table.
     :param results_list_filename: file name of the open greedy results list, expected to be in own_results folder
     :param output_filename: file name of the output excel file
     :param BFLP_MIP_filename: file name of the corresponding results for the BFLP MIP in order to compare the results
@@ -299,7 +299,7 @@ def write_results_open_greedy_table(results_list_filename, output_filename, BLFP
 
 def write_results_Schmitt_Singh_table(results_list_filename, output_filename, BLFP_MIP_filename, output_abs_path = None):
     '''
-    Given a json format of the Schmitt Singh heuristics results, saves the relevant results as an excel table.
+    Given a results list file of the Schmitt Singh heuristics results, saves the relevant results as an excel table.
     :param results_list_filename: file name of the Schmitt Singh heuristic results list, expected to be in own_results folder
     :param output_filename: file name of the output excel file
     :param BFLP_MIP_filename: file name of the corresponding results for the BFLP MIP in order to compare the results
@@ -358,7 +358,7 @@ def get_results_all_BUAP_methods(users_and_facs_df, travel_dict, users, facs, op
                         cap_factor=1.5,define_u = True,cutoff_relaxation = 0.0,
                          num_consider_relaxation = 20,
                         cutoff_localsearch = 0.2, time_limit_while_localsearch = 1,
-                        output_filename = "BUAP_heuristics.json"):
+                        output_filename = "BUAP_heuristics.msgpack"):
     '''
     Functions for running all the BUAP methods on a single instance.
     :param users_and_facs_df: dataframe of the user and facility related input data
@@ -497,7 +497,7 @@ def get_results_all_BUAP_methods(users_and_facs_df, travel_dict, users, facs, op
 
 def write_BUAP_results_table(results_list_filename, MIP_objective, output_filename, output_abs_path = None):
     '''
-    Given a json format of the BUAP heuristics results, saves the relevant results as an excel table.
+    Given a results list file of the BUAP heuristics results, saves the relevant results as an excel table.
     :param results_list_filename: file name of the BUAP heuristic results list, expected to be in own_results folder
     :param output_filename: file name of the output excel file
     :param MIP_objective: objective value of the MIP in order to compare the heuristic performance with this
@@ -589,7 +589,7 @@ def get_results_localsearch(users_and_facs_df, travel_dict, input_filename, outp
                                 cutoff_BUAP_localsearch = cutoff_BUAP_localsearch, 
                                 time_limit_while_BUAP_localsearch = time_limit_while_BUAP_localsearch,
                                 depth_greedy_reassignment = depth, fix_assignment = fix_assignment,
-                                output_filename = "test.json", write_to_file = False)
+                                output_filename = "test.msgpack", write_to_file = False)
                     overall_result = localsearch_result.copy()
                     overall_result["starting_results"] = result.copy()
                     output_results_list.append(overall_result)
@@ -657,7 +657,7 @@ def get_results_localsearch_without_change(users_and_facs_df, travel_dict, input
                                 cutoff_BUAP_localsearch = cutoff_BUAP_localsearch,
                                 time_limit_while_BUAP_localsearch = time_limit_while_BUAP_localsearch,
                                 depth_greedy_reassignment = depth, fix_assignment = fix_assignment,
-                                output_filename = "test_without_change.json")
+                                output_filename = "test_without_change.msgpack")
 
                     overall_result = localsearch_result.copy()
                     overall_result["starting_results"] = result.copy()
@@ -667,7 +667,7 @@ def get_results_localsearch_without_change(users_and_facs_df, travel_dict, input
 
 def write_results_localsearch_table(results_list_filename, output_filename,BLFP_MIP_filename, output_abs_path = None):
     '''
-    Given a json format of BFLP local search results, saves the relevant results as an excel table.
+    Given a results list file of BFLP local search results, saves the relevant results as an excel table.
     :param results_list_filename: file name of the BFLP local search results list, expected to be in own_results folder
     :param output_filename: file name of the output excel file
     :param BFLP_MIP_filename: file name of the corresponding results for the BFLP MIP in order to compare the results
@@ -1,72 +1,293 @@
 """
 Utility and help functions
-Note that all function until geodesic distance are from or adapted from
-https://github.com/schmitt-hub/preferential_access_and_fairness_in_waste_management
+Note that the functions f_urban, f_rural, create_travel_dict, save_travel_dict, load_users_and_facs,
+load_travel_dict, load_facility_distance_dict, load_input_data, write_results_list and read_results_list
+are from or adapted from https://github.com/schmitt-hub/preferential_access_and_fairness_in_waste_management
 """
 
 import os
-from math import exp
+import math
+import time
+import functools
+import hashlib
+from multiprocessing import shared_memory
+from math import exp, log
 import numpy as np
 import pandas as pd
 from geopy import distance
+from numba import njit, prange
 import json
+import msgpack
 import bz2
 import _pickle as cPickle
-import random
+import zstandard as zstd
 from typing import List
 from pathlib import Path
 
+# mean earth radius of WGS84 in kilometers
+EARTH_RADIUS_KM = 6371.0088
+
+# first bytes of zstandard files, used to detect the compression of data files
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
 # functions for computing travel probabilities
+@njit(cache=True)
 def f_urban(d):
+    # d ** beta is evaluated as exp(beta * log(d)); d is bounded away from 0 to keep log(d) finite
+    log_d = log(max(d, 1e-300))
     if d < 5:
-        return exp(-0.2550891696011455 * d ** 0.8674531576586394)
+        return exp(-0.2550891696011455 * exp(0.8674531576586394 * log_d))
     else:
-        return 4.639450774188538 * exp(-1.4989521421856289 * d ** 0.3288777336829004)
+        return 4.639450774188538 * exp(-1.4989521421856289 * exp(0.3288777336829004 * log_d))
 
 
+@njit(cache=True)
 def f_rural(d):
+    # d ** beta is evaluated as exp(beta * log(d)); d is bounded away from 0 to keep log(d) finite
+    log_d = log(max(d, 1e-300))
     if d < 5:
-        return exp(-0.24990116894290326 * d ** 0.8201058149904008)
+        return exp(-0.24990116894290326 * exp(0.8201058149904008 * log_d))
     else:
-        return 1.6114912595353221 * exp(-0.6887217475464711 * d ** 0.43652329253292316)
+        return 1.6114912595353221 * exp(-0.6887217475464711 * exp(0.43652329253292316 * log_d))
+
+
+@njit(cache=True)
+def haversine_distance(lat_1, lon_1, lat_2, lon_2):
+    """
+    Compute the haversine distance between two points
+    :param lat_1: latitude of the first point in degrees
+    :param lon_1: longitude of the first point in degrees
+    :param lat_2: latitude of the second point in degrees
+    :param lon_2: longitude of the second point in degrees
+    :return: distance in kilometers
+    """
+    lat_1 = math.radians(lat_1)
+    lat_2 = math.radians(lat_2)
+    a = math.sin((lat_1 - lat_2) / 2) ** 2 + \
+        math.cos(lat_1) * math.cos(lat_2) * math.sin(math.radians(lon_1 - lon_2) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
 
 
-def create_travel_dict(users_and_facs_df, users, facs, output_filename = 'travel_dict'):
+@njit(parallel=True, cache=True)
+def fill_travel_matrix(user_lat, user_lon, is_urban, fac_lat, fac_lon, travel_matrix):
+    """
+    Compute the haversine distance and the resulting travel probability of each user to each facility,
+        in parallel over the users
+    :param user_lat: array of the latitudes of the users in radians
+    :param user_lon: array of the longitudes of the users in radians
+    :param is_urban: boolean array indicating which users are urban
+    :param fac_lat: array of the latitudes of the facilities in radians
+    :param fac_lon: array of the longitudes of the facilities in radians
+    :param travel_matrix: array of shape (len(user_lat), len(fac_lat)) that is filled with the travel probabilities
+    """
+    # the haversine term equals a quarter of the squared chord between the points on the unit sphere,
+    # so with the unit vectors precomputed no trigonometric function is evaluated per pair
+    fac_x = np.cos(fac_lat) * np.cos(fac_lon)
+    fac_y = np.cos(fac_lat) * np.sin(fac_lon)
+    fac_z = np.sin(fac_lat)
+    for row in prange(user_lat.size):
+        user_x = math.cos(user_lat[row]) * math.cos(user_lon[row])
+        user_y = math.cos(user_lat[row]) * math.sin(user_lon[row])
+        user_z = math.sin(user_lat[row])
+        for col in range(fac_lat.size):
+            dx = user_x - fac_x[col]
+            dy = user_y - fac_y[col]
+            dz = user_z - fac_z[col]
+            a = min((dx * dx + dy * dy + dz * dz) / 4, 1.0)
+            dist = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+            if is_urban[row]:
+                travel_matrix[row, col] = f_urban(dist)
+            else:
+                travel_matrix[row, col] = f_rural(dist)
+
+
+def create_travel_matrix(users_and_facs_df, users, facs, block_size = 512):
+    """
+    Compute the travel probabilities for each travel combination as a dense matrix
+    :param users_and_facs_df: dataframe of the user and facility related input data
+    :param users: list of the users used in the instance
+    :param facs: list of the facilities used in the instance
+    :param block_size: number of users for which the travel probabilities are computed at once
+    :return: float32 array of shape (len(users), len(facs)) whose entry [i, j] is the probability
+        that the i-th user travels to the j-th facility
+    """
+    user_lat = np.deg2rad(users_and_facs_df.loc[users, 'centroid_lat'].to_numpy(dtype=float))
+    user_lon = np.deg2rad(users_and_facs_df.loc[users, 'centroid_lon'].to_numpy(dtype=float))
+    is_urban = (users_and_facs_df.loc[users, 'regional spatial type'] == "urban").to_numpy()
+    fac_lat = np.deg2rad(users_and_facs_df.loc[facs, 'rc_centroid_lat'].to_numpy(dtype=float))
+    fac_lon = np.deg2rad(users_and_facs_df.loc[facs, 'rc_centroid_lon'].to_numpy(dtype=float))
+    travel_matrix = np.empty((len(users), len(facs)), dtype=np.float32)
+    for start in range(0, len(users), block_size):
+        stop = min(start + block_size, len(users))
+        print('users', start, 'to', stop - 1)
+        fill_travel_matrix(user_lat[start:stop], user_lon[start:stop], is_urban[start:stop], fac_lat, fac_lon,
+                           travel_matrix[start:stop])
+    return travel_matrix
+
+
+def create_travel_dict(users_and_facs_df, users, facs, output_filename = 'travel_dict', block_size = 512):
     """
     Create the travel dictionary that specifies the probabilities for each travel combination
+        and save it as a travel matrix file (output_filename + ".npy.zst") in the data folder
     :param users_and_facs_df: dataframe of the user and facility related input data
     :param users: list of the users used in the instance
     :param facs: list of the facilities used in the instance
+    :param output_filename: name of the output file without extension
+    :param block_size: number of users for which the travel probabilities are computed at once
     :return: travel dictionary that specifies the probabilities for each travel combination
     """
-    travel_dict = {i: {} for i in users}
-    for i in users:
-        print('user', i)
-        regiotype = users_and_facs_df.at[i, 'regional spatial type']
-        lat_1 = users_and_facs_df.at[i, 'centroid_lat']
-        lon_1 = users_and_facs_df.at[i, 'centroid_lon']
-        for j in facs:
-            lat_2 = users_and_facs_df.at[j, 'rc_centroid_lat']
-            lon_2 = users_and_facs_df.at[j, 'rc_centroid_lon']
-            dist = distance.distance((lat_1, lon_1), (lat_2, lon_2)).km
-            if regiotype == "urban":
-                travel_dict[i][j] = f_urban(dist)
-            else:
-                travel_dict[i][j] = f_rural(dist)
-    #with open(output_filename + '.json', 'w') as outfile:
-    #    json.dump(travel_dict, outfile)
-    save_travel_dict(travel_dict, travel_dict_filename=output_filename+ ".json.pbz2")
+    travel_matrix = create_travel_matrix(users_and_facs_df, users, facs, block_size)
+    save_travel_matrix(travel_matrix, users, facs, travel_matrix_filename=output_filename + ".npy.zst")
+    return travel_matrix_to_dict(travel_matrix, users, facs)
+
+
+def travel_matrix_to_dict(travel_matrix, users, facs):
+    """
+    Convert a travel matrix into the travel dictionary used by the heuristics and models
+    :param travel_matrix: array of shape (len(users), len(facs)) of the travel probabilities
+    :param users: list of the users corresponding to the rows of the travel matrix
+    :param facs: list of the facilities corresponding to the columns of the travel matrix
+    :return: dictionary with key user and value dictionary of travel probabilities to each facility
+    """
+    facs = [int(j) for j in facs]
+    return {int(i): dict(zip(facs, row)) for i, row in zip(users, travel_matrix.tolist())}
 
 
 # functions for loading and saving data files
 
+def open_compressed(path):
+    """
+    Open a zstandard or bz2 compressed file for reading; the compression is detected from the first bytes of the file
+    :param path: path of the file
+    :return: file object of the decompressed data
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(len(ZSTD_MAGIC))
+    if magic == ZSTD_MAGIC:
+        return zstd.ZstdDecompressor().stream_reader(open(path, 'rb'))
+    return bz2.BZ2File(path, 'rb')
+
+
 def save_travel_dict(travel_dict, travel_dict_filename, abs_path=None):
+    """
+    Save a travel dictionary as a bz2 compressed pickle if the filename ends in .pbz2 (e.g., travel_dict.json.pbz2),
+        otherwise as a zstandard compressed pickle (e.g., travel_dict.pkl.zst)
+    :param travel_dict: dictionary of the travel probabilities from each user to each facility
+    :param travel_dict_filename: name of the travel dictionary file
+    :param abs_path: folder of the file, defaults to the data folder
+    """
     if not abs_path:
         abs_path = os.getcwd() + "/data"
     if not os.path.exists(abs_path):
         os.makedirs(abs_path)
-    with bz2.BZ2File(Path(abs_path + "/" + travel_dict_filename), "w") as f:
-        cPickle.dump(travel_dict, f)
+    if travel_dict_filename.endswith(".pbz2"):
+        with bz2.BZ2File(Path(abs_path + "/" + travel_dict_filename), "w") as f:
+            cPickle.dump(travel_dict, f)
+        return
+    with open(Path(abs_path + "/" + travel_dict_filename), "wb") as raw, \
+            zstd.ZstdCompressor(level=10, threads=-1).stream_writer(raw) as f:
+        cPickle.dump(travel_dict, f, protocol=5)
+
+
+def save_travel_matrix(travel_matrix, users, facs, travel_matrix_filename, abs_path=None):
+    if not abs_path:
+        abs_path = os.getcwd() + "/data"
+    if not os.path.exists(abs_path):
+        os.makedirs(abs_path)
+    with open(Path(abs_path + "/" + travel_matrix_filename), "wb") as raw, \
+            zstd.ZstdCompressor(level=10, threads=-1).stream_writer(raw) as f:
+        np.save(f, np.asarray(users, dtype=np.int64))
+        np.save(f, np.asarray(facs, dtype=np.int64))
+        np.save(f, np.asarray(travel_matrix, dtype=np.float32))
+
+
+def load_travel_matrix(travel_matrix_filename="travel_dict.npy.zst", abs_path=None):
+    """
+    Load a travel matrix saved with save_travel_matrix
+    :param travel_matrix_filename: name of the travel matrix file
+    :param abs_path: folder of the file, defaults to the data folder
+    :return: float32 array of the travel probabilities, array of the users corresponding to its rows
+        and array of the facilities corresponding to its columns
+    """
+    if not abs_path:
+        abs_path = os.getcwd() + "/data"
+    with open_compressed(Path(abs_path + "/" + travel_matrix_filename)) as f:
+        users = np.lib.format.read_array(f)
+        facs = np.lib.format.read_array(f)
+        travel_matrix = np.lib.format.read_array(f)
+    return travel_matrix, users, facs
+
+
+def load_travel_matrix_shared(travel_matrix_filename="travel_dict.npy.zst", abs_path=None, timeout=60):
+    """
+    Load a travel matrix into shared memory, or attach to it if another process has already loaded it,
+        so that parallel worker processes use the same copy of the matrix. The shared memory block is named
+        after the path and modification time of the file; load the matrix in the parent process before
+        starting the workers. The returned shared memory block has to be kept referenced while the arrays are
+        used, and the process for which created is True should call unlink on it once it is no longer needed.
+    :param travel_matrix_filename: name of the travel matrix file
+    :param abs_path: folder of the file, defaults to the data folder
+    :param timeout: seconds to wait for another process to finish filling the shared memory block
+    :return: float32 array of the travel probabilities, array of the users corresponding to its rows,
+        array of the facilities corresponding to its columns, the shared memory block holding them
+        and whether this call created the shared memory block
+    """
+    if not abs_path:
+        abs_path = os.getcwd() + "/data"
+    path = str(Path(abs_path + "/" + travel_matrix_filename).resolve())
+    file_id = path + ":" + str(os.stat(path).st_mtime_ns)
+    shm_name = "td_" + hashlib.sha1(file_id.encode()).hexdigest()[:16]
+    created = False
+    try:
+        shm = shared_memory.SharedMemory(name=shm_name)
+    except FileNotFoundError:
+        travel_matrix, users, facs = load_travel_matrix(os.path.basename(path), os.path.dirname(path))
+        size = 8 * (3 + len(users) + len(facs)) + travel_matrix.nbytes
+        try:
+            shm = shared_memory.SharedMemory(name=shm_name, create=True, size=size)
+            created = True
+        except FileExistsError:
+            # another process has created the block in the meantime
+            shm = shared_memory.SharedMemory(name=shm_name)
+        if created:
+            try:
+                header = np.ndarray(3, dtype=np.int64, buffer=shm.buf)
+                header[1:] = travel_matrix.shape
+                shared_travel_matrix, shared_users, shared_facs = shared_travel_matrix_arrays(shm)
+                shared_users[:] = users
+                shared_facs[:] = facs
+                shared_travel_matrix[:] = travel_matrix
+                # mark the block as filled only after all arrays have been written
+                header[0] = 1
+                del header, shared_travel_matrix, shared_users, shared_facs
+            except BaseException:
+                shm.close()
+                shm.unlink()
+                raise
+    deadline = time.monotonic() + timeout
+    while not np.ndarray(1, dtype=np.int64, buffer=shm.buf)[0]:
+        if time.monotonic() > deadline:
+            shm.close()
+            raise TimeoutError("The shared memory block " + shm_name + " of " + path + " was not filled within "
+                               + str(timeout) + " seconds; if the process loading it has failed, unlink the block")
+        time.sleep(0.01)
+    return shared_travel_matrix_arrays(shm) + (shm, created)
+
+
+def shared_travel_matrix_arrays(shm):
+    """
+    Get the arrays stored in a shared memory block created by load_travel_matrix_shared. The block starts with
+        a flag that is set once the block is filled and the number of users and facilities, followed by the users,
+        the facilities and the travel matrix.
+    :param shm: shared memory block
+    :return: travel matrix, users and facilities as arrays backed by the shared memory block
+    """
+    nr_of_users, nr_of_facs = np.ndarray(3, dtype=np.int64, buffer=shm.buf)[1:].tolist()
+    users = np.ndarray(nr_of_users, dtype=np.int64, buffer=shm.buf, offset=24)
+    facs = np.ndarray(nr_of_facs, dtype=np.int64, buffer=shm.buf, offset=24 + 8 * nr_of_users)
+    travel_matrix = np.ndarray((nr_of_users, nr_of_facs), dtype=np.float32, buffer=shm.buf,
+                               offset=24 + 8 * (nr_of_users + nr_of_facs))
+    return travel_matrix, users, facs
 
 
 def load_users_and_facs(users_and_facs_filename="users_and_facilities.csv", abs_path=None):
@@ -76,21 +297,48 @@ def load_users_and_facs(users_and_facs_filename="users_and_facilities.csv", abs_
     return users_and_facs_df
 
 
+def with_int_keys(travel_dict):
+    """
+    Make sure the users and facilities in a loaded travel dictionary are ints; older files have string keys.
+        Dictionaries that already have int keys are returned as they are.
+    :param travel_dict: dictionary of the travel probabilities from each user to each facility
+    :return: travel dictionary with int keys
+    """
+    i = next(iter(travel_dict), 0)
+    j = next(iter(travel_dict[i]), 0) if travel_dict else 0
+    if type(i) is int and type(j) is int:
+        return travel_dict
+    return {int(i): {int(j): travel_dict[i][j] for j in travel_dict[i]} for i in travel_dict}
+
+
 def load_travel_dict(travel_dict_filename="travel_dict.json.pbz2", abs_path=None):
+    """
+    Load a travel dictionary. The loaded dictionaries of the most recently used files are kept in memory
+        and returned again as long as the file is unchanged, so the returned dictionary must not be modified.
+    :param travel_dict_filename: name of the travel dictionary or travel matrix file
+    :param abs_path: folder of the file, defaults to the data folder
+    :return: dictionary of the travel probabilities from each user to each facility
+    """
     if not abs_path:
         abs_path = os.getcwd() + "/data"
-    data = bz2.BZ2File(Path(abs_path + "/" + travel_dict_filename), 'rb')
-    travel_dict = cPickle.load(data)
-    travel_dict = {int(i): {int(j): travel_dict[i][j] for j in travel_dict[i]} for i in travel_dict}
-    return travel_dict
+    path = str(Path(abs_path + "/" + travel_dict_filename).resolve())
+    return _load_travel_dict_cached(path, os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_travel_dict_cached(path, mtime_ns):
+    if path.endswith(".npy.zst"):
+        return travel_matrix_to_dict(*load_travel_matrix(os.path.basename(path), os.path.dirname(path)))
+    with open_compressed(path) as data:
+        travel_dict = cPickle.load(data)
+    return with_int_keys(travel_dict)
 
 def load_facility_distance_dict(facility_distance_dict_filename = "facility_distance_dict.json.pbz2", abs_path=None):
     if not abs_path:
         abs_path = os.getcwd() + "/data"
-    data = bz2.BZ2File(Path(abs_path + "/" + facility_distance_dict_filename), 'rb')
-    travel_dict = cPickle.load(data)
-    travel_dict = {int(i): {int(j): travel_dict[i][j] for j in travel_dict[i]} for i in travel_dict}
-    return travel_dict
+    with open_compressed(Path(abs_path + "/" + facility_distance_dict_filename)) as data:
+        travel_dict = cPickle.load(data)
+    return with_int_keys(travel_dict)
 
 def load_input_data(
     users_and_facilities_filename="users_and_facilities.csv",
@@ -102,22 +350,35 @@ def load_input_data(
     return users_and_facs_df, travel_dict
 
 def write_results_list(results, output_filename, output_abs_path = None):
-    # save the table
+    """
+    Save a results list as msgpack, or as json if the output filename ends in .json
+    :param results: results list to save
+    :param output_filename: filename, if no output_abs_path given in own_results folder
+    :param output_abs_path: absolute path of the folder to save the results list in
+    """
     if not output_abs_path:
         output_abs_path = os.getcwd() + "/own_results"
     if not os.path.exists(output_abs_path):
         os.makedirs(output_abs_path)
-    with open(Path(output_abs_path + "/" + output_filename), 'w') as f:
-        json.dump(results, f)
+    if output_filename.endswith(".json"):
+        with open(Path(output_abs_path + "/" + output_filename), 'w') as f:
+            json.dump(results, f)
+    else:
+        with open(Path(output_abs_path + "/" + output_filename), 'wb') as f:
+            f.write(msgpack.packb(results, use_bin_type=True))
 
 def read_results_list(filename, abs_path = None):
     """
-    Read a results list and fix keys being string instead of int
+    Read a results list saved as msgpack, or as json if the filename ends in .json;
+        msgpack keeps the int keys, for json the keys being string instead of int are fixed
     :param filename: filename, if no abs_path given in own_results folder
-    :return: results list with fixed keys being int
+    :return: results list with keys being int
     """
     if not abs_path:
         abs_path = os.getcwd() + "/own_results"
+    if not filename.endswith(".json"):
+        with open(Path(abs_path+"/"+filename), 'rb') as infile:
+            return msgpack.unpackb(infile.read(), raw=False, strict_map_key=False)
     with open(Path(abs_path+"/"+filename), 'r') as infile:
         results_list = json.load(infile)
     for results in results_list:
@@ -125,18 +386,61 @@ def read_results_list(filename, abs_path = None):
                                                      results['solution_details']['assignment'].items()}
     return results_list
 
-def geodesic_distance(users_and_facs_df, i, j):
+def geodesic_distance(users_and_facs_df, i, j, metric="haversine"):
     """
     Compute the geodesic distance from user i to facility j
     :param users_and_facs_df: dataframe of the user and facility related input data
     :param i: index of the user
     :param j: index of the facility
+    :param metric: "haversine" for the great-circle distance on the mean earth radius, which is what the
+        travel probabilities are computed with, or "karney" for the exact distance on the WGS84 ellipsoid using geopy
     :return: distance in kilometers from user i to facility j
     """
-    return distance.distance(
-        (users_and_facs_df.at[i, 'centroid_lat'], users_and_facs_df.at[i, 'centroid_lon']),
-        (users_and_facs_df.at[j, 'rc_centroid_lat'],
-         users_and_facs_df.at[j, 'rc_centroid_lon'])).km
+    coordinates = (users_and_facs_df.at[i, 'centroid_lat'], users_and_facs_df.at[i, 'centroid_lon'],
+                   users_and_facs_df.at[j, 'rc_centroid_lat'], users_and_facs_df.at[j, 'rc_centroid_lon'])
+    if metric == "haversine":
+        return haversine_distance(*coordinates)
+    if metric == "karney":
+        return _cached_geodesic_distance(*coordinates)
+    raise ValueError("Unknown metric " + str(metric) + ", use haversine or karney")
+
+
+# distances are cached by coordinates, so that the cache stays valid across dataframes
+@functools.lru_cache(maxsize=2 ** 20)
+def _cached_geodesic_distance(lat_1, lon_1, lat_2, lon_2):
+    return distance.distance((lat_1, lon_1), (lat_2, lon_2)).km
+
+
+def assignment_arrays(users_and_facs_df, travel_dict, facs, assignment):
+    """
+    Convert an assignment into arrays; users that are "unassigned" are left out.
+    :param users_and_facs_df: dataframe of the user and facility related input data
+    :param travel_dict: dictionary of the travel probabilities from each user to each facility
+    :param facs: list of the facilities used in the instance
+    :param assignment: dictionary of key user, value facility
+    :return: array of the assigned users and for each of them the position of its facility in facs,
+        its population and its travel probability to its facility
+    """
+    fac_positions = {j: k for k, j in enumerate(facs)}
+    assigned_pairs = [(i, j) for i, j in assignment.items() if j != "unassigned"]
+    assigned = [i for i, _ in assigned_pairs]
+    fac_idx = np.fromiter((fac_positions[j] for _, j in assigned_pairs), dtype=np.int32, count=len(assigned_pairs))
+    population = users_and_facs_df.loc[assigned, 'population'].to_numpy(dtype=float)
+    probabilities = np.fromiter((travel_dict[i][j] for i, j in assigned_pairs), dtype=float,
+                                count=len(assigned_pairs))
+    return np.array(assigned, dtype=np.int64), fac_idx, population, probabilities
+
+
+def expected_travelers_per_facility(fac_idx, population, probabilities, nr_of_facs):
+    """
+    Compute the expected number of travelers to each facility
+    :param fac_idx: array of the position of the facility of each assigned user
+    :param population: array of the population of each assigned user
+    :param probabilities: array of the travel probability of each assigned user to its facility
+    :param nr_of_facs: number of facilities
+    :return: array of the expected number of travelers to each facility
+    """
+    return np.bincount(fac_idx, weights=population * probabilities, minlength=nr_of_facs)
 
 
 def capacity_constraints_slack(users_and_facs_df, travel_dict,cap_dict, facs, assignment):
@@ -151,12 +455,16 @@ def capacity_constraints_slack(users_and_facs_df, travel_dict,cap_dict, facs, as
         array of facilities who do not have their capacity constraint satisfied,
         dictionary with key facilities and value list of users assigned to that facility in assignment
     """
+    assigned, fac_idx, population, probabilities = assignment_arrays(users_and_facs_df, travel_dict, facs,
+                                                                     assignment)
+    fac_slacks = np.array([cap_dict[j] for j in facs], dtype=float) - \
+        expected_travelers_per_facility(fac_idx, population, probabilities, len(facs))
     slacks = cap_dict.copy()
-    assigned_users = {j: [] for j in facs}
-    for i, j in assignment.items():
-        assigned_users[j].append(i)
-        slacks[j] = slacks[j] - users_and_facs_df.at[i, 'population'] * travel_dict[i][j]
-    not_satisfed = [j for j in facs if slacks[j] < 0]
+    slacks.update(zip(facs, fac_slacks.tolist()))
+    order = np.argsort(fac_idx, kind='stable')
+    bounds = np.searchsorted(fac_idx[order], np.arange(len(facs) + 1))
+    assigned_users = dict(zip(facs, (users_j.tolist() for users_j in np.split(assigned[order], bounds[1:-1]))))
+    not_satisfed = [facs[k] for k in np.flatnonzero(fac_slacks < 0)]
     return slacks, not_satisfed, assigned_users
 
 
@@ -174,18 +482,18 @@ def check_valid_solution(users_and_facs_df, travel_dict, facs, open_facs, users,
     :return: true if assignment is valid, false otherwise.
     """
     # check each user assigned to a facility
-    if(not all(i in assignment.keys() for i in users)):
+    if(not assignment.keys() >= set(users)):
         print("Some user is not assigned a facility")
         return False
     # check only open facilities used 
-    if(not all(j in open_facs for j in assignment.values())):
+    if(not set(open_facs).issuperset(assignment.values())):
         print("Some user is assigned to a closed facility")
         return False
     # check capacity constraints satisfied
-    slacks = {j: cap_factor * users_and_facs_df.at[j, 'capacity'] for j in facs}
-    for i, j in assignment.items():
-        slacks[j] = slacks[j] - users_and_facs_df.at[i, 'population'] * travel_dict[i][j]
-    not_satisfed = [j for j in facs if slacks[j] < 0]
+    capacities = cap_factor * users_and_facs_df.loc[facs, 'capacity'].to_numpy(dtype=float)
+    _, fac_idx, population, probabilities = assignment_arrays(users_and_facs_df, travel_dict, facs, assignment)
+    slacks = capacities - expected_travelers_per_facility(fac_idx, population, probabilities, len(facs))
+    not_satisfed = [facs[k] for k in np.flatnonzero(slacks < 0)]
     if len(not_satisfed) > 0:
         print("Capacity constraints not satisfied")
         print(not_satisfed)
@@ -194,7 +502,8 @@ def check_valid_solution(users_and_facs_df, travel_dict, facs, open_facs, users,
     if len(open_facs) > round(budget_factor*len(facs)):
         print("Too many facilities open ")
         return False
-    objective = sum(cap_factor*users_and_facs_df.at[j, "capacity"]*(slacks[j]/(cap_factor*users_and_facs_df.at[j, "capacity"]))**2 for j in facs)
+    # C_j (slack_j / C_j)^2 = slack_j^2 / C_j; facilities without capacity have no slack left at this point
+    objective = float(np.sum(np.divide(slacks ** 2, capacities, out=np.zeros_like(slacks), where=capacities > 0)))
     print("Objective: " + str(objective))
     return True
 
@@ -213,19 +522,18 @@ def check_valid_solution_with_unassigned(users_and_facs_df, travel_dict, facs, o
     :return: true if assignment is valid, false otherwise
     """
     # check each user assigned to a facility
-    if(not all(i in assignment.keys() for i in users)):
+    if(not assignment.keys() >= set(users)):
         print("Some user is not assigned a facility")
         return False
     # check only open facilities used 
-    if(not all(j in open_facs or j=="unassigned" for j in assignment.values())):
+    if(not (set(open_facs) | {"unassigned"}).issuperset(assignment.values())):
         print("Some user is assigned to a closed facility")
         return False
     # check capacity constraints satisfied
-    slacks = {j: cap_factor * users_and_facs_df.at[j, 'capacity'] for j in facs}
-    for i, j in assignment.items():
-        if j != "unassigned":
-            slacks[j] = slacks[j] - users_and_facs_df.at[i, 'population'] * travel_dict[i][j]
-    not_satisfed = [j for j in facs if slacks[j] < 0]
+    capacities = cap_factor * users_and_facs_df.loc[facs, 'capacity'].to_numpy(dtype=float)
+    _, fac_idx, population, probabilities = assignment_arrays(users_and_facs_df, travel_dict, facs, assignment)
+    slacks = capacities - expected_travelers_per_facility(fac_idx, population, probabilities, len(facs))
+    not_satisfed = [facs[k] for k in np.flatnonzero(slacks < 0)]
     if len(not_satisfed) > 0:
         print("Capacity constraints not satisfied")
         print(not_satisfed)
@@ -234,16 +542,18 @@ def check_valid_solution_with_unassigned(users_and_facs_df, travel_dict, facs, o
     if len(open_facs) > round(budget_factor*len(facs)):
         print("Too many facilities open ")
         return False
-    objective = sum(cap_factor*users_and_facs_df.at[j, "capacity"]*(slacks[j]/(cap_factor*users_and_facs_df.at[j, "capacity"]))**2 for j in facs)
+    # C_j (slack_j / C_j)^2 = slack_j^2 / C_j; facilities without capacity have no slack left at this point
+    objective = float(np.sum(np.divide(slacks ** 2, capacities, out=np.zeros_like(slacks), where=capacities > 0)))
     print("Objective: " + str(objective))
     return True
 
-def generate_data(n_users: int, p_fac: float, output_file_name_prefix = "large_random_instance"):
+def generate_data(n_users: int, p_fac: float, output_file_name_prefix = "large_random_instance", seed = None):
     '''
-    Generates random BFLP instance and saves a users_and_facs_df and a dictionary of P_ij (travel_dict) for this instance.
+    Generates random BFLP instance and saves a users_and_facs_df and a matrix of P_ij (travel matrix) for this instance.
     :param: n_users: number of users of generated instance
     :param: p_fac: probability each ZIP code has a facility
     :param: output_file_name_prefix: First part of the name for the files in which the instance is saved
+    :param: seed: seed of the random number generator
     '''
     # Longitude and latitude range for Germany
     #lon_min, lon_max = 5.8663153, 15.0419319
@@ -256,25 +566,21 @@ def generate_data(n_users: int, p_fac: float, output_file_name_prefix = "large_r
     lon_min, lon_max = 9.0, 11.5
     lat_min, lat_max = 47.3, 49.0
 
-    data = []
+    rng = np.random.default_rng(seed)
+    lon = rng.uniform(lon_min, lon_max, n_users)
+    lat = rng.uniform(lat_min, lat_max, n_users)
+    population = rng.integers(0, 20000, n_users, endpoint=True)
+    capacity = np.where(rng.random(n_users) < p_fac, rng.integers(0, 80000, n_users, endpoint=True), 0)
+    spatial_type = np.where(rng.random(n_users) < 0.5, "rural", "urban")
+    users_and_facs_df = pd.DataFrame({'zipcode': np.arange(n_users), 'centroid_lat': lat, 'centroid_lon': lon,
+                                      'regional spatial type': spatial_type, 'population': population,
+                                      'capacity': capacity, 'rc_centroid_lat': lat + rng.normal(0.0, 0.01, n_users),
+                                      'rc_centroid_lon': lon + rng.normal(0.0, 0.01, n_users)})
     users = list(range(n_users))
-    facs = []
-    for i in range(n_users):
-        zip = i
-        lon = random.uniform(lon_min, lon_max)
-        lat = random.uniform(lat_min, lat_max)
-        population = random.randint(0, 20000)
-        capacity = random.randint(0, 80000) if random.random() < p_fac else 0
-        if capacity > 0:
-            facs.append(i)
-        spatial_type = "rural" if random.random() < 0.5 else "urban"
-        data.append({'zipcode': zip,'centroid_lat': lat,'centroid_lon': lon, 
-                     'regional spatial type': spatial_type,'population': population, 
-                     'capacity': capacity,'rc_centroid_lat': lat + random.gauss(0.0, 0.01),
-                     'rc_centroid_lon': lon + random.gauss(0.0, 0.01)})
-    users_and_facs_df = pd.DataFrame(data)
+    facs = np.flatnonzero(capacity > 0).tolist()
     users_and_facs_df.to_csv("data/"+ output_file_name_prefix+'_users_and_facs.csv', index=False)
-    create_travel_dict(users_and_facs_df, users, facs, output_filename=output_file_name_prefix+'_travel_dict')
+    travel_matrix = create_travel_matrix(users_and_facs_df, users, facs)
+    save_travel_matrix(travel_matrix, users, facs, travel_matrix_filename=output_file_name_prefix+'_travel_dict.npy.zst')
 
 def create_users_facs_by_zip_code_division(users_and_facs_df, users,facs):
     """
@@ -285,18 +591,22 @@ def create_users_facs_by_zip_code_division(users_and_facs_df, users,facs):
     :param facs: list of the facilities used in the instance
     :return: list of dictionaries of users and facs split by the first two digits of their ZIP codes
     """
-    zip_codes_starts = []
-    for i in users:
-        if str(users_and_facs_df.at[i, "zipcode"])[0:2] not in zip_codes_starts:
-            zip_codes_starts.append(str(users_and_facs_df.at[i, "zipcode"])[0:2])
-
-    split_users = {start: [] for start in zip_codes_starts}
-    split_facs = {start: [] for start in zip_codes_starts}
-    for i in users:
-        split_users[str(users_and_facs_df.at[i, "zipcode"])[0:2]].append(i)
-
-    for j in facs:
-        split_facs[str(users_and_facs_df.at[j, "zipcode"])[0:2]].append(j)
+    user_zip_codes_starts = users_and_facs_df.loc[users, "zipcode"].astype(str).str[0:2].to_numpy(dtype=str)
+    fac_zip_codes_starts = users_and_facs_df.loc[facs, "zipcode"].astype(str).str[0:2].to_numpy(dtype=str)
+    users_array = np.asarray(users)
+    facs_array = np.asarray(facs)
+
+    # ZIP code starts in the order in which they first appear among the users
+    starts, first_user, user_groups = np.unique(user_zip_codes_starts, return_index=True, return_inverse=True)
+    split_users = {}
+    split_facs = {}
+    for k in np.argsort(first_user).tolist():
+        split_users[str(starts[k])] = users_array[user_groups == k].tolist()
+        split_facs[str(starts[k])] = []
+
+    starts, fac_groups = np.unique(fac_zip_codes_starts, return_inverse=True)
+    for k, start in enumerate(starts.tolist()):
+        split_facs[start] = facs_array[fac_groups == k].tolist()
     return split_users, split_facs
 
 def create_larger_sets_by_combining_zip_code_starts(users_and_facs_df, users, facs):
@@ -313,16 +623,20 @@ def create_larger_sets_by_combining_zip_code_starts(users_and_facs_df, users, fa
     combined_zip_codes = {"63, 97, 96, 95" : [63, 97, 96, 95], "90, 91, 92": [90, 91, 92],
                             "93, 94": [93, 94], "80, 81, 82, 83, 84, 85" : [80, 81, 82, 83, 84, 85],
                             "86, 87,88, 89": [86, 87, 88, 89]}
+    # map each ZIP code start to the combined set it belongs to
+    combined_key_of_start = {}
+    for key_combined, value_combined in combined_zip_codes.items():
+        combined_key_of_start.update(dict.fromkeys(value_combined, key_combined))
     split_users_combined = {start: [] for start in combined_zip_codes.keys()}
     split_facs_combined = {start: [] for start in combined_zip_codes.keys()}
     for key, value in split_users.items():
-        for key_combined,value_combined  in combined_zip_codes.items():
-            if int(key) in value_combined:
-                split_users_combined[key_combined].extend(value)
+        key_combined = combined_key_of_start.get(int(key))
+        if key_combined is not None:
+            split_users_combined[key_combined].extend(value)
     for key, value in split_facs.items():
-        for key_combined,value_combined  in combined_zip_codes.items():
-            if int(key) in value_combined:
-                split_facs_combined[key_combined].extend(value)
+        key_combined = combined_key_of_start.get(int(key))
+        if key_combined is not None:
+            split_facs_combined[key_combined].extend(value)
     return split_users_combined, split_facs_combined
 
 def get_instance_2_users_facs(users_and_facs_df, users, facs):
@@ -355,13 +669,15 @@ def load_an_instance(instance_number, sufficient_cap = False):
     
     suff_postfix = "suff_" if sufficient_cap else ""
     uaf_filename = "instance_" + actual_instance_number + "_" + suff_postfix + "users_and_facs.csv"
-    td_filename = "instance_" + actual_instance_number + "_travel_dict.json.pbz2"
+    td_filename = "instance_" + actual_instance_number + "_travel_dict.npy.zst"
+    if not os.path.exists(Path(os.getcwd() + "/data/" + td_filename)):
+        td_filename = "instance_" + actual_instance_number + "_travel_dict.json.pbz2"
 
     users_and_facs_df, travel_dict = load_input_data(users_and_facilities_filename=uaf_filename,
                                                 travel_dict_filename=td_filename)
     
     users = [int(i) for i in users_and_facs_df.index]
-    facs = [i for i in users_and_facs_df.index if users_and_facs_df.at[i, 'capacity'] > 0]
+    facs = users_and_facs_df.index[users_and_facs_df['capacity'] > 0].tolist()
     if instance_number == 2:
         users, facs = get_instance_2_users_facs(users_and_facs_df, users, facs)
 